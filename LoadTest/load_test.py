@@ -0,0 +1,291 @@
+"""
+Chat API Load Test
+------------------------------------------------------
+✅ Replays a realistic mix of chat messages (bookings, status, seats, policy)
+✅ Drives /api/chat with asyncio + one pooled HTTP session
+✅ Reports throughput, latency percentiles and error rate per intent
+✅ Ships a local stub server so it runs without Next.js / MongoDB
+
+Usage:
+    python load_test.py --stub                      # stub server + load test
+    python load_test.py --url http://localhost:3000/api/chat -c 20 -n 500
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+
+import aiohttp
+from aiohttp import web
+
+# ---------- CONFIG ----------
+API_URL = "http://localhost:3000/api/chat"
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 8765
+CONCURRENCY = 10
+TOTAL_REQUESTS = 200
+REQUEST_TIMEOUT = 10  # seconds, per request
+POOL_SIZE = 50  # cap on concurrent connections in the shared session (raised to match concurrency)
+STUB_LATENCY_MS = (5, 40)  # simulated handleUserMessage + Mongo time
+# ----------------------------
+
+# Weighted message mix, grouped by the intent chatHandler.ts routes them to.
+MESSAGE_MIX = {
+    "bookings": {
+        "weight": 35,
+        "templates": [
+            "show bookings for customer {cid}",
+            "my bookings {cid}",
+            "I want to see my bookings, customer id {cid}",
+        ],
+    },
+    "status": {
+        "weight": 30,
+        "templates": [
+            "what is the status of {flight}",
+            "flight status {flight}",
+            "is {flight} on time? status please",
+        ],
+    },
+    "seats": {
+        "weight": 20,
+        "templates": [
+            "seat availability on {flight}",
+            "any window seat left on {flight}?",
+        ],
+    },
+    "policy": {
+        "weight": 10,
+        "templates": [
+            "what is the cancellation policy",
+            "tell me the refund policy",
+        ],
+    },
+    "unknown": {
+        "weight": 5,
+        "templates": [
+            "hello",
+            "what's the weather in Boston",
+        ],
+    },
+}
+
+# Must match chatHandler.ts's /[a-zA-Z]{2}\d+/ or the handler returns before hitting Mongo.
+FLIGHT_NUMBERS = ["AI202", "UK811", "BA142", "LH760", "EK501"]
+FLIGHT_PATTERN = re.compile(r"[a-zA-Z]{2}\d+")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+# Prefix of chatHandler.ts's early-return prompts for a missing customer ID / flight number.
+MISSING_INPUT_PREFIX = "Please provide"
+
+
+def build_message(rng: random.Random):
+    """Pick an intent by weight and render one of its message templates."""
+    intents = list(MESSAGE_MIX)
+    weights = [MESSAGE_MIX[i]["weight"] for i in intents]
+    intent = rng.choices(intents, weights=weights, k=1)[0]
+    template = rng.choice(MESSAGE_MIX[intent]["templates"])
+    message = template.format(cid=rng.randint(1, 500), flight=rng.choice(FLIGHT_NUMBERS))
+    return intent, message
+
+
+# --- Load Generator ---
+
+async def send_one(session, url, intent, message, results):
+    """POST one chat message the same way chat_bot/app.py does and record the outcome."""
+    start = time.perf_counter()
+    error = None
+    try:
+        async with session.post(url, json={"message": message}) as resp:
+            body = await resp.text()
+            if resp.status != 200:
+                error = f"HTTP {resp.status}"
+            else:
+                try:
+                    data = json.loads(body)
+                except ValueError:
+                    error = "invalid JSON"
+                else:
+                    # An early "Please provide ..." reply means no task or Mongo query ran.
+                    if isinstance(data, dict) and str(data.get("message", "")).startswith(MISSING_INPUT_PREFIX):
+                        error = "missing input"
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except aiohttp.ClientError as e:
+        error = type(e).__name__
+    except Exception as e:
+        error = f"unexpected {type(e).__name__}"
+
+    results.append({
+        "intent": intent,
+        "latency": time.perf_counter() - start,
+        "error": error,
+    })
+
+
+async def run_load(url, concurrency, total, seed=None):
+    """Fire `total` requests with at most `concurrency` in flight over one pooled session."""
+    rng = random.Random(seed)
+    messages = [build_message(rng) for _ in range(total)]
+    queue = asyncio.Queue()
+    for item in messages:
+        queue.put_nowait(item)
+
+    results = []
+    # Size the pool to the worker count so requests never wait on the connector.
+    connector = aiohttp.TCPConnector(limit=max(concurrency, POOL_SIZE))
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    async def worker():
+        while True:
+            try:
+                intent, message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await send_one(session, url, intent, message, results)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return results, elapsed
+
+
+# --- Reporting ---
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(results, elapsed):
+    """Aggregate raw results into overall and per-intent statistics."""
+    groups = {"ALL": results}
+    for r in results:
+        groups.setdefault(r["intent"], []).append(r)
+
+    summary = {}
+    for name, rows in groups.items():
+        latencies = sorted(r["latency"] * 1000 for r in rows)
+        errors = [r["error"] for r in rows if r["error"]]
+        summary[name] = {
+            "requests": len(rows),
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p90_ms": round(percentile(latencies, 90), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "error_rate": round(len(errors) / len(rows), 4) if rows else 0.0,
+            "errors": {e: errors.count(e) for e in set(errors)},
+        }
+    return summary
+
+
+def print_report(summary, elapsed):
+    """Print a fixed-width table of the summary."""
+    print("\n" + "=" * 20 + " LOAD TEST REPORT " + "=" * 20)
+    print(f"Wall time: {elapsed:.2f}s")
+    header = f"{'intent':<10}{'reqs':>6}{'rps':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'err%':>8}"
+    print(header)
+    print("-" * len(header))
+    for name in ["ALL"] + sorted(k for k in summary if k != "ALL"):
+        s = summary[name]
+        print(
+            f"{name:<10}{s['requests']:>6}{s['throughput_rps']:>9.1f}"
+            f"{s['p50_ms']:>9.1f}{s['p90_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}"
+            f"{s['error_rate'] * 100:>7.1f}%"
+        )
+        if s["errors"]:
+            print(f"{'':<10}errors: {s['errors']}")
+    print("=" * len(header))
+
+
+# --- Stub Server ---
+
+async def stub_chat(request):
+    """Mimic /api/chat routing from chatHandler.ts with simulated backend latency."""
+    try:
+        payload = await request.json()
+        message = str(payload["message"]).lower().strip()
+    except (ValueError, KeyError):
+        return web.json_response({"error": "message is required"}, status=500)
+
+    flight_match = FLIGHT_PATTERN.search(message)
+    number_match = NUMBER_PATTERN.search(message)
+
+    # Same order and early returns as handleUserMessage; only tasks pay the simulated latency.
+    if "book" in message or "my bookings" in message or "show bookings" in message:
+        if not number_match:
+            return web.json_response({"message": "Please provide your customer ID to view your bookings."})
+        task = "getBookingsByCustomer"
+    elif "status" in message:
+        if not flight_match:
+            return web.json_response({"message": "Please provide the flight number to check status."})
+        task = "getFlightStatus"
+    elif "seat" in message:
+        if not flight_match:
+            return web.json_response({"message": "Please provide the flight number to check seat availability."})
+        task = "getSeatAvailability"
+    elif "policy" in message:
+        task = "getCancellationPolicy"
+    else:
+        task = "unknown"
+
+    await asyncio.sleep(random.uniform(*STUB_LATENCY_MS) / 1000)
+    return web.json_response({"task": task, "result": {"message": "stub response"}})
+
+
+async def start_stub_server(host=STUB_HOST, port=STUB_PORT):
+    """Start the stub server in the current event loop and return its runner."""
+    app = web.Application()
+    app.router.add_post("/api/chat", stub_chat)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"🟢 Stub server listening on http://{host}:{port}/api/chat")
+    return runner
+
+
+# --- Main execution ---
+
+async def main(args):
+    runner = None
+    url = args.url
+    if args.stub:
+        runner = await start_stub_server(port=args.stub_port)
+        url = f"http://{STUB_HOST}:{args.stub_port}/api/chat"
+
+    try:
+        print(f"🔍 Sending {args.requests} requests to {url} (concurrency={args.concurrency})")
+        results, elapsed = await run_load(url, args.concurrency, args.requests, seed=args.seed)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+    summary = summarize(results, elapsed)
+    print_report(summary, elapsed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"✅ Saved report → {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the airline chat API.")
+    parser.add_argument("--url", default=API_URL, help="Chat endpoint to target")
+    parser.add_argument("-c", "--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("-n", "--requests", type=int, default=TOTAL_REQUESTS)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible message mix")
+    parser.add_argument("--stub", action="store_true", help="Run against a local stub server")
+    parser.add_argument("--stub-port", type=int, default=STUB_PORT)
+    parser.add_argument("-o", "--output", help="Write the JSON summary to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,200 @@
+"""
+Adaptive Decoding Policy
+------------------------------------------------------
+✅ Classifies a question (yes/no, fee amount, explanation)
+✅ Picks beams / max_new_tokens / early stopping per request
+✅ Degrades to cheaper decoding under load instead of queueing
+✅ Exports every chosen policy and its latency for tuning
+
+Note: queue depth counts generate calls in flight in this process. The
+interactive loop in query.py runs one query at a time, so there it is always 0
+and only the latency-vs-SLO escalation adapts the policy. The busy/overloaded
+levels take effect once generate_answer is served from concurrent threads.
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# ---------- CONFIG ----------
+LATENCY_SLO_SECONDS = 8.0  # Target end-to-end generation time per answer
+POLICY_LOG_FILE = "decoding_policy_log.jsonl"
+EWMA_ALPHA = 0.3  # Weight of the newest latency sample in the running average
+
+# Base policy per question type, used when the system is idle.
+BASE_POLICIES = {
+    "yes_no": {"num_beams": 2, "max_new_tokens": 48, "early_stopping": True},
+    "fee_amount": {"num_beams": 3, "max_new_tokens": 48, "early_stopping": True},
+    "explanation": {"num_beams": 5, "max_new_tokens": 256, "early_stopping": True},
+}
+
+# Queue depth at which each load level starts.
+LOAD_LEVELS = [
+    ("normal", 0),
+    ("busy", 2),
+    ("overloaded", 5),
+]
+# ----------------------------
+
+YES_NO_STARTERS = (
+    "is", "are", "can", "could", "do", "does", "did", "will", "would",
+    "should", "may", "am", "was", "were", "has", "have",
+)
+FEE_PATTERN = re.compile(r"\b(fee|cost|price|charge)s?\b")
+FEE_PHRASES = ("how much", "$", "refund amount")
+# Anything after the first word that asks for more than a yes/no answer.
+MULTI_CLAUSE_PATTERN = re.compile(r"\b(explain|what|how|rules)\b| and ")
+
+_lock = threading.Lock()
+_in_flight = 0
+_avg_latency = {}  # question type -> EWMA of observed latency (seconds)
+_seen_types = set()  # question types whose cold-start sample was already skipped
+
+
+def classify_question(question: str) -> str:
+    """Return 'yes_no', 'fee_amount' or 'explanation' for a user question."""
+    text = question.strip().lower()
+    if FEE_PATTERN.search(text) or any(phrase in text for phrase in FEE_PHRASES):
+        return "fee_amount"
+    parts = re.split(r"\W+", text, maxsplit=1) if text else [""]
+    first_word, rest = parts[0], (parts[1] if len(parts) > 1 else "")
+    if first_word in YES_NO_STARTERS:
+        # Only single-clause questions get the short yes/no budget.
+        if text.count("?") <= 1 and not MULTI_CLAUSE_PATTERN.search(" " + rest):
+            return "yes_no"
+    return "explanation"
+
+
+def current_queue_depth() -> int:
+    """Number of generate calls currently in flight."""
+    with _lock:
+        return _in_flight
+
+
+@contextmanager
+def track_request():
+    """Count a generate call as in flight for the duration of the block."""
+    global _in_flight
+    with _lock:
+        _in_flight += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+def _load_level(queue_depth: int, question_type: str) -> str:
+    """Map queue depth and recent latency against the SLO to a load level."""
+    level = LOAD_LEVELS[0][0]
+    for name, threshold in LOAD_LEVELS:
+        if queue_depth >= threshold:
+            level = name
+
+    # Escalate one step if this question type has recently blown the SLO.
+    avg = _avg_latency.get(question_type)
+    if avg is not None and avg > LATENCY_SLO_SECONDS:
+        names = [name for name, _ in LOAD_LEVELS]
+        level = names[min(names.index(level) + 1, len(names) - 1)]
+    return level
+
+
+def choose_policy(question: str, queue_depth: int = None) -> dict:
+    """
+    Pick decoding parameters for a question given the current load.
+    Under load we shrink beams and answer length rather than making callers wait.
+    """
+    if queue_depth is None:
+        queue_depth = current_queue_depth()
+    question_type = classify_question(question)
+    with _lock:
+        level = _load_level(queue_depth, question_type)
+
+    policy = dict(BASE_POLICIES[question_type])
+    if level == "busy":
+        policy["num_beams"] = max(1, policy["num_beams"] // 2)
+        policy["max_new_tokens"] = max(16, policy["max_new_tokens"] // 2)
+    elif level == "overloaded":
+        policy["num_beams"] = 1  # Greedy decoding
+        policy["max_new_tokens"] = max(16, policy["max_new_tokens"] // 4)
+
+    # early_stopping only applies to beam search.
+    if policy["num_beams"] == 1:
+        policy["early_stopping"] = False
+
+    policy["question_type"] = question_type
+    policy["load_level"] = level
+    policy["queue_depth"] = queue_depth
+    return policy
+
+
+def generation_kwargs(policy: dict) -> dict:
+    """Extract only the arguments that model.generate() understands."""
+    return {
+        "num_beams": policy["num_beams"],
+        "max_new_tokens": policy["max_new_tokens"],
+        "early_stopping": policy["early_stopping"],
+    }
+
+
+def record_latency(policy: dict, latency_seconds: float):
+    """Update the running latency average and append the sample to the log."""
+    question_type = policy["question_type"]
+    with _lock:
+        # The first call per type includes warm-up cost, so keep it out of the average.
+        if question_type not in _seen_types:
+            _seen_types.add(question_type)
+        elif question_type not in _avg_latency:
+            _avg_latency[question_type] = latency_seconds
+        else:
+            prev = _avg_latency[question_type]
+            _avg_latency[question_type] = EWMA_ALPHA * latency_seconds + (1 - EWMA_ALPHA) * prev
+
+    entry = dict(policy)
+    entry["latency_seconds"] = round(latency_seconds, 4)
+    entry["slo_seconds"] = LATENCY_SLO_SECONDS
+    entry["within_slo"] = latency_seconds <= LATENCY_SLO_SECONDS
+    entry["timestamp"] = time.time()
+    try:
+        with open(POLICY_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write decoding policy log: {e}")
+
+
+def summarize_log(path: str = POLICY_LOG_FILE) -> dict:
+    """Aggregate the exported log per (question type, load level) for tuning."""
+    groups = {}
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        print(f"⚠️ No decoding policy log found at {path}. Run query.py first to collect samples.")
+        return {}
+    with f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # e.g. a line truncated by a killed process
+            key = f"{entry['question_type']}/{entry['load_level']}"
+            groups.setdefault(key, []).append(entry["latency_seconds"])
+
+    summary = {}
+    for key, latencies in sorted(groups.items()):
+        latencies.sort()
+        summary[key] = {
+            "count": len(latencies),
+            "mean_seconds": round(sum(latencies) / len(latencies), 4),
+            "p95_seconds": latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)],
+            "over_slo": sum(1 for x in latencies if x > LATENCY_SLO_SECONDS),
+        }
+    return summary
+
+
+if __name__ == "__main__":
+    print(json.dumps(summarize_log(), indent=2))
@@ -4,6 +4,9 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 import torch
+import time
+
+from decoding_policy import choose_policy, generation_kwargs, record_latency, track_request
 
 # --- CONFIG ---
 INDEX_FILE = "policy_index.faiss"
@@ -76,13 +79,16 @@ def generate_answer(context, question, model, tokenizer):
     device = model.device
     inputs = tokenizer(prompt, return_tensors="pt", max_length=1024, truncation=True).to(device)
     
+    # Pick beams / answer length for this question and the current load
+    policy = choose_policy(question)
+    print(f"Decoding policy: {policy['question_type']} @ {policy['load_level']} "
+          f"(beams={policy['num_beams']}, max_new_tokens={policy['max_new_tokens']})")
+
     # Generate the answer
-    outputs = model.generate(
-        **inputs, 
-        max_length=256,  # Max length of the *answer*
-        num_beams=5,      # Use beam search for better results
-        early_stopping=True
-    )
+    with track_request():
+        start = time.perf_counter()
+        outputs = model.generate(**inputs, **generation_kwargs(policy))
+        record_latency(policy, time.perf_counter() - start)
     answer = tokenizer.decode(outputs[0], skip_special_tokens=True)
     return answer
 
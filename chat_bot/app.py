@@ -2,6 +2,17 @@ import streamlit as st
 import requests
 
 API_URL = "http://localhost:3000/api/chat"
+REQUEST_TIMEOUT = 15  # seconds
+
+
+def get_session():
+    """One pooled HTTP session per browser session, reused across Streamlit reruns."""
+    # Kept in session_state rather than st.cache_resource: requests.Session is not
+    # guaranteed thread-safe and its cookie jar must not be shared between users.
+    if "http_session" not in st.session_state:
+        st.session_state.http_session = requests.Session()
+    return st.session_state.http_session
+
 
 st.title("✈️ Airline Assistant")
 
@@ -12,7 +23,7 @@ if st.button("Submit"):
         st.warning("Please enter a message!")
     else:
         try:
-            response = requests.post(API_URL, json={"message": user_input})
+            response = get_session().post(API_URL, json={"message": user_input}, timeout=REQUEST_TIMEOUT)
             data = response.json()
         except Exception as e:
             st.error(f"Error connecting to backend: {e}")
@@ -76,10 +87,16 @@ if st.button("Submit"):
                         "passengers": passengers_data,
                     }
 
-                    booking_response = requests.post(
-                        API_URL, json={"message": "confirm booking", "inputData": booking_data}
-                    )
-                    booking_result = booking_response.json()
+                    try:
+                        booking_response = get_session().post(
+                            API_URL,
+                            json={"message": "confirm booking", "inputData": booking_data},
+                            timeout=REQUEST_TIMEOUT,
+                        )
+                        booking_result = booking_response.json()
+                    except Exception as e:
+                        st.error(f"Error connecting to backend: {e}")
+                        st.stop()
 
                     st.success("✅ Booking Successful!")
 